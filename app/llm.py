@@ -1,33 +1,60 @@
+import asyncio
+import base64
 import os
 
+import numpy as np
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI, RateLimitError
 
 from app.logger import logger
 from app.definitions import QUERY_CACHE, EMBEDDING_CACHE
-from app.utilities import add_to_json, get_json, make_hash
+from app.store import JsonStore
+from app.utilities import make_hash
 
 load_dotenv()
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-query_cache = {}
-embedding_cache = {}
+async_client = None
+async_client_loop = None
 
-def get_completion(query, model="gpt-4o-mini", context=""):
-    # Todo write to and read from query cache
+embeddings_chunk_size = 1000
+completion_max_retries = 5
+
+
+def get_async_client():
+    # The httpx pool inside AsyncOpenAI binds its connections to the event loop
+    # that created them, so a client that outlives its loop raises
+    # "Event loop is closed" on reuse; rebuild the client whenever the loop changes.
+    global async_client, async_client_loop
+    loop = asyncio.get_running_loop()
+    if async_client is None or async_client_loop is not loop:
+        async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        async_client_loop = loop
+    return async_client
+
+query_cache = JsonStore(QUERY_CACHE)
+embedding_cache = JsonStore(EMBEDDING_CACHE)
 
-    global query_cache
-    if not query_cache:
-        query_cache = get_json(QUERY_CACHE)
 
+def flush_llm_caches():
+    query_cache.flush()
+    embedding_cache.flush()
+
+def get_cached_completion(query):
     query_hash = make_hash(query, 'qry-')
     if query_hash in query_cache:
-        logger.info(f"query cache hit")
-        data = query_cache[query_hash]
-        result = data["result"]
+        return query_cache[query_hash]["result"]
+    return None
+
+
+def get_completion(query, model="gpt-4o-mini", context=""):
+    query_hash = make_hash(query, 'qry-')
+    if query_hash in query_cache:
+        logger.debug("query cache hit")
+        result = query_cache[query_hash]["result"]
     else:
-        logger.info(f"new query")
+        logger.debug("new query")
         system_message = [{"role": "developer", "content": context}] if context else []
         messages = [{"role": "user", "content": query}]
 
@@ -38,7 +65,38 @@ def get_completion(query, model="gpt-4o-mini", context=""):
         )
         result = response.choices[0].message.content
 
-        add_to_json(QUERY_CACHE, query_hash, {"query": query, "result": result})
+        query_cache[query_hash] = {"query": query, "result": result}
+
+    return result
+
+
+async def aget_completion(query, model="gpt-4o-mini", context=""):
+    query_hash = make_hash(query, 'qry-')
+    if query_hash in query_cache:
+        logger.debug("query cache hit")
+        return query_cache[query_hash]["result"]
+
+    logger.debug("new query")
+    system_message = [{"role": "developer", "content": context}] if context else []
+    messages = [{"role": "user", "content": query}]
+
+    for attempt in range(completion_max_retries):
+        try:
+            response = await get_async_client().chat.completions.create(
+                model=model,
+                store=True,
+                messages=system_message + messages
+            )
+            break
+        except RateLimitError:
+            if attempt == completion_max_retries - 1:
+                raise
+            delay = 2 ** attempt
+            logger.info(f"rate limited, retrying in {delay}s")
+            await asyncio.sleep(delay)
+    result = response.choices[0].message.content
+
+    query_cache[query_hash] = {"query": query, "result": result}
 
     return result
 
@@ -58,23 +116,44 @@ def get_chat_completion(query, model="gpt-4o-mini", context="", chat_history=[])
 
 
 def get_embedding(content, model="text-embedding-3-small"):
-    global embedding_cache
-    if not embedding_cache:
-        embedding_cache = get_json(EMBEDDING_CACHE)
-
     content_hash = make_hash(content, 'emb-')
     if content_hash in embedding_cache:
-        logger.info(f"Embedding cache hit")
+        logger.debug("Embedding cache hit")
 
-        embedding = embedding_cache[content_hash]
+        embedding = np.asarray(embedding_cache[content_hash], dtype=np.float32)
     else:
-        logger.info(f"New embedding")
+        logger.debug("New embedding")
         response = client.embeddings.create(
             model=model,
             input=content,
         )
-        embedding = response.data[0].embedding
-        add_to_json(EMBEDDING_CACHE, content_hash, embedding)
-
+        embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+        embedding_cache[content_hash] = embedding
 
     return embedding
+
+
+def get_embeddings(contents, model="text-embedding-3-small"):
+    content_hashes = [make_hash(content, 'emb-') for content in contents]
+    embeddings = [
+        np.asarray(embedding, dtype=np.float32) if embedding is not None else None
+        for embedding in (embedding_cache.get(content_hash) for content_hash in content_hashes)
+    ]
+
+    missing_indexes = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    logger.info(f"{len(contents) - len(missing_indexes)} embedding cache hits, {len(missing_indexes)} new embeddings")
+
+    for start in range(0, len(missing_indexes), embeddings_chunk_size):
+        chunk = missing_indexes[start:start + embeddings_chunk_size]
+        response = client.embeddings.create(
+            model=model,
+            input=[contents[i] for i in chunk],
+            encoding_format="base64",
+        )
+        for i, data in zip(chunk, response.data):
+            embeddings[i] = np.frombuffer(base64.b64decode(data.embedding), dtype=np.float32)
+            embedding_cache[content_hashes[i]] = embeddings[i]
+
+    embedding_cache.flush()
+
+    return embeddings
@@ -6,11 +6,11 @@ from app.definitions import LOG_DIR
 logger = logging.getLogger("mini-rag")
 
 
-def set_logger(log_file: str):
-    logger.setLevel(logging.DEBUG)
+def set_logger(log_file: str, level=logging.INFO):
+    logger.setLevel(level)
 
     file_handler = logging.FileHandler(os.path.join(LOG_DIR, log_file))
-    file_handler.setLevel(logging.DEBUG)
+    file_handler.setLevel(level)
 
     formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     file_handler.setFormatter(formatter)
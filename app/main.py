@@ -9,15 +9,18 @@
 # Todo: implement naive/local/global/hybrid queries
 # Todo: implement delete doc
 # Todo: explore kag patterns/strategies
+import asyncio
+import atexit
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import networkx as nx
 import numpy as np
 
-from nano_vectordb import NanoVectorDB
-
-from app.llm import get_embedding, get_completion
+from app.llm import aget_completion, get_embedding, get_embeddings, get_completion, get_cached_completion, \
+    flush_llm_caches
 from app.logger import logger, set_logger
 
 from app.definitions import INPUT_DOCS_DIR, SOURCE_TO_DOC_ID_MAP, DOC_ID_TO_SOURCE_MAP, EMBEDDINGS_DB, \
@@ -26,30 +29,99 @@ from app.definitions import INPUT_DOCS_DIR, SOURCE_TO_DOC_ID_MAP, DOC_ID_TO_SOUR
 from app.prompts import get_query_system_prompt, excerpt_summary_prompt, get_extract_entities_prompt, \
     get_high_low_level_keywords_prompt
 
-from app.utilities import get_json, remove_from_json, read_file, get_docs, make_hash, add_to_json, \
-    create_file_if_not_exists, split_string_by_multi_markers, clean_str, extract_json_from_text, is_float_regex, \
-    delete_all_files
+from app.store import SOURCE_TO_DOC_ID_STORE, DOC_ID_TO_SOURCE_STORE, DOC_ID_TO_EXCERPT_IDS_STORE, EXCERPT_STORE, \
+    flush_document_stores
+from app.utilities import read_file, get_docs, make_hash, create_file_if_not_exists, \
+    split_string_by_multi_markers, clean_str, extract_json_from_text, is_float_regex, delete_all_files
+from app.vector_store import NanoVectorStore
 
 dim = 1536
-embeddings_db = NanoVectorDB(dim, storage_file=EMBEDDINGS_DB)
-entities_db = NanoVectorDB(dim, storage_file=ENTITIES_DB)
-relationships_db = NanoVectorDB(dim, storage_file=RELATIONSHIPS_DB)
+vector_dtype = np.float32
+summary_concurrency = 16
+extraction_concurrency = 8
+embeddings_db = NanoVectorStore(dim, storage_file=EMBEDDINGS_DB)
+entities_db = NanoVectorStore(dim, storage_file=ENTITIES_DB)
+relationships_db = NanoVectorStore(dim, storage_file=RELATIONSHIPS_DB)
+
+kg_graph = None
+kg_graph_dirty = False
+
+
+def get_kg_graph():
+    global kg_graph
+    if kg_graph is None:
+        if os.path.exists(KG_DB):
+            try:
+                kg_graph = nx.read_graphml(KG_DB)
+                logger.info(f"Loaded existing graph from {KG_DB}")
+            except Exception as e:
+                logger.error(f"Error loading graph from {KG_DB}: {e}")
+                kg_graph = nx.Graph()
+        else:
+            kg_graph = nx.Graph()
+            logger.info("No existing graph found. Creating a new graph.")
+    return kg_graph
 
 
-def remove_document_by_id(doc_id):
-    doc_id_to_excerpt_ids = get_json(DOC_ID_TO_EXCERPT_IDS)
-    doc_id_to_source_map = get_json(DOC_ID_TO_SOURCE_MAP)
-    if doc_id in doc_id_to_source_map:
-        source = doc_id_to_source_map[doc_id]
-        remove_from_json(DOC_ID_TO_SOURCE_MAP, doc_id)
-        remove_from_json(SOURCE_TO_DOC_ID_MAP, source)
-    if doc_id in doc_id_to_excerpt_ids:
-        excerpt_ids = doc_id_to_excerpt_ids[doc_id]
-        for excerpt_id in excerpt_ids:
-            remove_from_json(EXCERPT_DB, excerpt_id)
-        remove_from_json(DOC_ID_TO_EXCERPT_IDS, doc_id)
-        embeddings_db.delete(excerpt_ids)
+def save_kg_graph():
+    global kg_graph_dirty
+    if kg_graph is not None and kg_graph_dirty:
+        nx.write_graphml(kg_graph, KG_DB)
+        kg_graph_dirty = False
+
+
+flush_interval = 30.0
+flush_thread = None
+flush_stop_event = threading.Event()
+flush_lock = threading.Lock()
+
+
+def flush_all():
+    with flush_lock:
         embeddings_db.save()
+        entities_db.save()
+        relationships_db.save()
+        flush_document_stores()
+        flush_llm_caches()
+        save_kg_graph()
+
+
+def start_background_flush(interval=flush_interval):
+    global flush_thread
+    if flush_thread is not None:
+        return
+
+    def flush_loop():
+        while not flush_stop_event.wait(interval):
+            try:
+                flush_all()
+            except Exception as e:
+                logger.error(f"background flush failed: {e}")
+
+    flush_thread = threading.Thread(target=flush_loop, name="background-flush", daemon=True)
+    flush_thread.start()
+    atexit.register(stop_background_flush)
+
+
+def stop_background_flush():
+    flush_stop_event.set()
+    if flush_thread is not None:
+        flush_thread.join()
+    flush_all()
+
+
+def remove_document_by_id(doc_id):
+    with flush_lock:
+        if doc_id in DOC_ID_TO_SOURCE_STORE:
+            source = DOC_ID_TO_SOURCE_STORE.pop(doc_id)
+            SOURCE_TO_DOC_ID_STORE.pop(source)
+        excerpt_ids = DOC_ID_TO_EXCERPT_IDS_STORE.pop(doc_id)
+        if excerpt_ids:
+            for excerpt_id in excerpt_ids:
+                EXCERPT_STORE.pop(excerpt_id)
+            embeddings_db.delete(excerpt_ids)
+            embeddings_db.save()
+        flush_document_stores()
 
 
 def import_documents():
@@ -58,187 +130,103 @@ def import_documents():
         content = read_file(source)
         doc_id = make_hash(content, "doc_")
 
-        source_to_doc_id_map = get_json(SOURCE_TO_DOC_ID_MAP)
-
-        if source not in source_to_doc_id_map:
+        if source not in SOURCE_TO_DOC_ID_STORE:
             logger.info(f"importing new document {source} with id {doc_id}")
+            excerpts = get_excerpts(content)
             add_document_maps(source, content)
-            embed_document(content, doc_id)
-            extract_entities(content, doc_id)
-        elif source_to_doc_id_map[source] != doc_id:
+            embed_document(content, doc_id, excerpts)
+            extract_entities(doc_id, excerpts)
+        elif SOURCE_TO_DOC_ID_STORE[source] != doc_id:
             logger.info(f"updating existing document {source} with id {doc_id}")
-            old_doc_id = source_to_doc_id_map[source]
+            old_doc_id = SOURCE_TO_DOC_ID_STORE[source]
             remove_document_by_id(old_doc_id)
+            excerpts = get_excerpts(content)
             add_document_maps(source, content)
-            embed_document(content, doc_id)
-            extract_entities(content, doc_id)
+            embed_document(content, doc_id, excerpts)
+            extract_entities(doc_id, excerpts)
         else:
             logger.info(f"no changes, skipping document {source} with id {doc_id}")
 
+    flush_all()
+
 
 def add_document_maps(source, content):
     doc_id = make_hash(content, "doc_")
-    add_to_json(SOURCE_TO_DOC_ID_MAP, source, doc_id)
-    add_to_json(DOC_ID_TO_SOURCE_MAP, doc_id, source)
+    with flush_lock:
+        SOURCE_TO_DOC_ID_STORE[source] = doc_id
+        DOC_ID_TO_SOURCE_STORE[doc_id] = source
 
 
-def embed_document(content, doc_id):
-    excerpts = get_excerpts(content)
-    excerpt_ids = []
-    for i, excerpt in enumerate(excerpts):
-        excerpt_id = make_hash(excerpt, "excerpt_id_")
-        excerpt_ids.append(excerpt_id)
-        summary = get_excerpt_summary(content, excerpt)
-        embedding_content = f"{excerpt}\n\n{summary}"
-        embedding_result = get_embedding(embedding_content)
-        vector = np.array(embedding_result, dtype=np.float32)
+def embed_document(content, doc_id, excerpts):
+    excerpt_ids = [make_hash(excerpt, "excerpt_id_") for excerpt in excerpts]
+    summaries = get_excerpt_summaries(content, excerpts)
+    embedding_contents = [f"{excerpt}\n\n{summary}" for excerpt, summary in zip(excerpts, summaries)]
+    embedding_results = get_embeddings(embedding_contents)
+    with flush_lock:
         embeddings_db.upsert([
-            {"__id__": excerpt_id, "__vector__": vector, "__doc_id__": doc_id, "__inserted_at__": time.time()}
+            {
+                "__id__": excerpt_id,
+                "__vector__": np.asarray(embedding_result, dtype=vector_dtype),
+                "__doc_id__": doc_id,
+                "__inserted_at__": time.time()
+            }
+            for excerpt_id, embedding_result in zip(excerpt_ids, embedding_results)
         ])
-        add_to_json(EXCERPT_DB, excerpt_id, {
-            "doc_id": doc_id,
-            "doc_order_index": i,
-            "excerpt": excerpt,
-            "summary": summary,
-            "indexed_at": time.time()
+        EXCERPT_STORE.update({
+            excerpt_id: {
+                "doc_id": doc_id,
+                "doc_order_index": i,
+                "excerpt": excerpt,
+                "summary": summary,
+                "indexed_at": time.time()
+            }
+            for i, (excerpt_id, excerpt, summary) in enumerate(zip(excerpt_ids, excerpts, summaries))
         })
-        logger.info(f"created embedding for {excerpt_id} — {embedding_result}")
+        DOC_ID_TO_EXCERPT_IDS_STORE[doc_id] = excerpt_ids
 
-    embeddings_db.save()
-    add_to_json(DOC_ID_TO_EXCERPT_IDS, doc_id, excerpt_ids)
+    logger.info(f"created embeddings for {len(excerpt_ids)} excerpts of {doc_id}")
+    logger.debug("excerpt ids: %s", excerpt_ids)
 
 
 def get_excerpts(content, n=2000, overlap=200):
-    excerpts = []
     step = n - overlap
-    for i in range(0, len(content), step):
-        excerpts.append(content[i:i + n])
-    return excerpts
+    return [content[i:i + n] for i in range(0, len(content), step)]
 
 
-def get_excerpt_summary(full_doc, excerpt):
-    prompt = excerpt_summary_prompt(full_doc, excerpt)
-    summary = get_completion(prompt)
+def get_excerpt_summaries(full_doc, excerpts):
+    async def gather_summaries():
+        semaphore = asyncio.Semaphore(summary_concurrency)
 
-    logger.info(f"Excerpt:\n{excerpt}\n\nSummary:\n{summary}")
+        async def bounded_summary(prompt):
+            async with semaphore:
+                return await aget_completion(prompt)
 
-    return summary
+        return await asyncio.gather(*[
+            bounded_summary(excerpt_summary_prompt(full_doc, excerpt)) for excerpt in excerpts
+        ])
 
+    summaries = asyncio.run(gather_summaries())
 
-def extract_entities(content, doc_id):
-    excerpts = get_excerpts(content)
-    if os.path.exists(KG_DB):
-        try:
-            graph = nx.read_graphml(KG_DB)
-            logger.info(f"Loaded existing graph from {KG_DB}")
-        except Exception as e:
-            logger.error(f"Error loading graph from {KG_DB}: {e}")
-            graph = nx.Graph()
-    else:
-        graph = nx.Graph()
-        logger.info("No existing graph found. Creating a new graph.")
+    for excerpt, summary in zip(excerpts, summaries):
+        logger.debug("Excerpt:\n%s\n\nSummary:\n%s", excerpt, summary)
 
-    for excerpt in excerpts:
-        excerpt_id = make_hash(excerpt, "excerpt_id_")
-        result = get_completion(get_extract_entities_prompt(excerpt))
-        logger.info(result)
-
-        data_str = result.replace(COMPLETE_TAG, '').strip()
-
-        records = split_string_by_multi_markers(data_str, [REC_SEP])
-
-        clean_records = []
-        for record in records:
-            if record.startswith('(') and record.endswith(')'):
-                record = record[1:-1]
-            clean_records.append(clean_str(record))
-        records = clean_records
-
-        for record in records:
-            fields = split_string_by_multi_markers(record, [TUPLE_SEP])
-            logger.info("FIELDS: " + ",".join(fields))
-            if not fields:
-                continue
-            fields = [field[1:-1] if field.startswith('"') and field.endswith('"') else field for field in fields]
-            logger.info("FIELDS TWO: " + ",".join(fields))
-            record_type = fields[0].lower()
-            logger.info(f"{record_type} {len(fields)}")
-            if record_type == 'entity':
-                if len(fields) >= 4:
-                    _, name, category, description = fields[:4]
-                    logger.info(f"Entity - Name: {name}, Category: {category}, Description: {description}")
-                    existing_node = graph.nodes.get(name)
-                    if existing_node:
-                        logger.info("NODE:" + str(existing_node))
-                        existing_descriptions = split_string_by_multi_markers(existing_node["description"], KG_SEP)
-                        descriptions = KG_SEP.join(set(list(existing_descriptions) + [description]))
-                        existing_categories = split_string_by_multi_markers(existing_node["category"], KG_SEP)
-                        categories = KG_SEP.join(set(list(existing_categories) + [category]))
-                        existing_excerpt_ids = split_string_by_multi_markers(existing_node["excerpt_id"], KG_SEP)
-                        excerpt_ids = KG_SEP.join(set(list(existing_excerpt_ids) + [excerpt_id]))
-                        # Todo: summarise descriptions with LLM query if they get too long
-                        graph.add_node(
-                            name,
-                            category=categories,
-                            description=descriptions,
-                            excerpt_id=excerpt_ids
-                        )
-                    else:
-                        graph.add_node(name, category=category, description=description, excerpt_id=excerpt_id)
-                    entity_id = make_hash(name, prefix="ent-")
-                    embedding_content = f"{name} {description}"
-                    embedding_result = get_embedding(embedding_content)
-                    vector = np.array(embedding_result, dtype=np.float32)
-                    entities_db.upsert([
-                        {
-                            "__id__": entity_id,
-                            "__vector__": vector,
-                            "__entity_name__": name,
-                            "__inserted_at__": time.time(),
-                        }
-                    ])
-            elif record_type == 'relationship':
-                if len(fields) >= 6:
-                    _, source, target, description, keywords, weight = fields[:6]
-                    source, target = sorted([source, target])
-                    logger.info(f"Relationship - Source: {source}, Target: {target}, Description: {description}, Keywords: {keywords}, Weight: {weight}, Excerpt ID: {excerpt_id}")
-                    # Todo: summarise descriptions with LLM query
-                    existing_edge = graph.edges.get((source, target))
-                    weight = float(weight) if is_float_regex(weight) else 1.0
-                    if existing_edge:
-                        print('HAS EXISTING EDGE' + str(existing_edge))
-                        existing_descriptions = split_string_by_multi_markers(existing_edge["description"], KG_SEP)
-                        descriptions = KG_SEP.join(set(list(existing_descriptions) + [description]))
-                        existing_keywords = split_string_by_multi_markers(existing_edge["keywords"], KG_SEP)
-                        keywords = KG_SEP.join(set(list(existing_keywords) + [keywords]))
-                        existing_excerpt_ids = split_string_by_multi_markers(existing_edge["excerpt_id"], KG_SEP)
-                        excerpt_ids = KG_SEP.join(set(list(existing_excerpt_ids) + [excerpt_id]))
-                        weight = sum([weight, existing_edge["weight"]])
-                        graph.add_edge(source, target, description=descriptions, keywords=keywords, weight=weight, excerpt_id=excerpt_ids)
-                    else:
-                        graph.add_edge(source, target, description=description, keywords=keywords, weight=weight, excerpt_id=excerpt_id)
-                    relationship_id = make_hash(f"{source}_{target}", prefix="ent-")
-                    embedding_content = f"{keywords} {source} {target} {description}"
-                    embedding_result = get_embedding(embedding_content)
-                    vector = np.array(embedding_result, dtype=np.float32)
-                    relationships_db.upsert([
-                        {
-                            "__id__": relationship_id,
-                            "__vector__": vector,
-                            "__source__": source,
-                            "__target__": target,
-                            "__inserted_at__": time.time(),
-                        }
-                    ])
-            elif record_type == 'content_keywords':
-                if len(fields) >= 2:
-                    logger.info(f"Content Keywords: {fields[1]}")
-                    graph.graph['content_keywords'] = fields[1]
-
-    entities_db.save()
-    relationships_db.save()
-
-    nx.write_graphml(graph, KG_DB)
+    return summaries
+
+
+def merge_kg_field(existing, addition):
+    parts = split_string_by_multi_markers(existing, [KG_SEP])
+    if addition in parts:
+        return existing
+    return KG_SEP.join(parts + [addition])
+
+
+def extract_entities(doc_id, excerpts):
+    graph = get_kg_graph()
+
+    with ThreadPoolExecutor(max_workers=extraction_concurrency) as executor:
+        results = list(executor.map(lambda excerpt: get_completion(get_extract_entities_prompt(excerpt)), excerpts))
+
+    merge_extraction_results(graph, excerpts, results)
     # # --- Verification: Print the Graph Contents ---
     # print("Nodes:")
     # for node, data in graph.nodes(data=True):
@@ -253,40 +241,159 @@ def extract_entities(content, doc_id):
     #     print("content_keywords:", graph.graph['content_keywords'])
 
 
+def parse_extraction_records(result):
+    """Parse an extraction completion into (record_type, fields) tuples in a single streaming pass."""
+    data_str = result.replace(COMPLETE_TAG, '').strip()
+    for record in split_string_by_multi_markers(data_str, [REC_SEP]):
+        if record.startswith('(') and record.endswith(')'):
+            record = record[1:-1]
+        fields = split_string_by_multi_markers(clean_str(record), [TUPLE_SEP])
+        logger.debug("FIELDS: %s", fields)
+        if not fields:
+            continue
+        fields = [field[1:-1] if field.startswith('"') and field.endswith('"') else field for field in fields]
+        logger.debug("FIELDS TWO: %s", fields)
+        yield fields[0].lower(), fields
+
+
+def merge_extraction_results(graph, excerpts, results):
+    global kg_graph_dirty
+
+    records = []
+    embedding_contents = []
+    for excerpt, result in zip(excerpts, results):
+        excerpt_id = make_hash(excerpt, "excerpt_id_")
+        logger.debug(result)
+
+        for record_type, fields in parse_extraction_records(result):
+            logger.debug("%s %s", record_type, len(fields))
+            if record_type == 'entity' and len(fields) >= 4:
+                records.append((record_type, excerpt_id, fields, len(embedding_contents)))
+                _, name, _, description = fields[:4]
+                embedding_contents.append(f"{name} {description}")
+            elif record_type == 'relationship' and len(fields) >= 6:
+                records.append((record_type, excerpt_id, fields, len(embedding_contents)))
+                _, source, target, description, keywords, _ = fields[:6]
+                source, target = sorted([source, target])
+                embedding_contents.append(f"{keywords} {source} {target} {description}")
+            elif record_type == 'content_keywords' and len(fields) >= 2:
+                records.append((record_type, excerpt_id, fields, None))
+
+    vectors = [
+        np.asarray(embedding_result, dtype=vector_dtype)
+        for embedding_result in get_embeddings(embedding_contents)
+    ] if embedding_contents else []
+
+    with flush_lock:
+        kg_graph_dirty = kg_graph_dirty or bool(records)
+        for record_type, excerpt_id, fields, embedding_index in records:
+            if record_type == 'entity':
+                merge_entity(graph, excerpt_id, fields, vectors[embedding_index])
+            elif record_type == 'relationship':
+                merge_relationship(graph, excerpt_id, fields, vectors[embedding_index])
+            else:
+                logger.debug("Content Keywords: %s", fields[1])
+                graph.graph['content_keywords'] = fields[1]
+
+
+def merge_entity(graph, excerpt_id, fields, vector):
+    _, name, category, description = fields[:4]
+    logger.debug("Entity - Name: %s, Category: %s, Description: %s", name, category, description)
+    existing_node = graph.nodes.get(name)
+    if existing_node:
+        logger.debug("NODE: %s", existing_node)
+        # Todo: summarise descriptions with LLM query if they get too long
+        graph.add_node(
+            name,
+            category=merge_kg_field(existing_node["category"], category),
+            description=merge_kg_field(existing_node["description"], description),
+            excerpt_id=merge_kg_field(existing_node["excerpt_id"], excerpt_id)
+        )
+    else:
+        graph.add_node(name, category=category, description=description, excerpt_id=excerpt_id)
+    entities_db.upsert([
+        {
+            "__id__": make_hash(name, prefix="ent-"),
+            "__vector__": vector,
+            "__entity_name__": name,
+            "__inserted_at__": time.time(),
+        }
+    ])
+
+
+def merge_relationship(graph, excerpt_id, fields, vector):
+    _, source, target, description, keywords, weight = fields[:6]
+    source, target = sorted([source, target])
+    logger.debug(
+        "Relationship - Source: %s, Target: %s, Description: %s, Keywords: %s, Weight: %s, Excerpt ID: %s",
+        source, target, description, keywords, weight, excerpt_id
+    )
+    # Todo: summarise descriptions with LLM query
+    existing_edge = graph.edges.get((source, target))
+    weight = float(weight) if is_float_regex(weight) else 1.0
+    if existing_edge:
+        logger.debug("HAS EXISTING EDGE %s", existing_edge)
+        graph.add_edge(
+            source,
+            target,
+            description=merge_kg_field(existing_edge["description"], description),
+            keywords=merge_kg_field(existing_edge["keywords"], keywords),
+            weight=weight + existing_edge["weight"],
+            excerpt_id=merge_kg_field(existing_edge["excerpt_id"], excerpt_id)
+        )
+    else:
+        graph.add_edge(source, target, description=description, keywords=keywords, weight=weight, excerpt_id=excerpt_id)
+    relationships_db.upsert([
+        {
+            "__id__": make_hash(f"{source}_{target}", prefix="ent-"),
+            "__vector__": vector,
+            "__source__": source,
+            "__target__": target,
+            "__inserted_at__": time.time(),
+        }
+    ])
+
+
 def query(text):
     logger.info(f"Received Query:\n{text}")
+    cached_result = get_cached_completion(text)
+    if cached_result is not None:
+        logger.info("query answered from cache")
+        return cached_result
     embedding = get_embedding(text)
-    embedding_array = np.array(embedding)
+    embedding_array = np.asarray(embedding, dtype=vector_dtype)
     results = embeddings_db.query(query=embedding_array, top_k=5, better_than_threshold=0.02)
-    excerpt_db = get_json(EXCERPT_DB)
-    system_prompt = get_query_system_prompt(excerpt_db, results)
+    system_prompt = get_query_system_prompt(EXCERPT_STORE.snapshot(), results)
+
+    result = get_completion(text, context=system_prompt.strip())
+    flush_llm_caches()
 
-    return get_completion(text, context=system_prompt.strip())
+    return result
 
 
 def kg_query(text):
     prompt = get_high_low_level_keywords_prompt(text)
     result = get_completion(prompt)
     keyword_data = extract_json_from_text(result)
-    logger.info(keyword_data)
+    logger.debug(keyword_data)
 
     ll_keywords = keyword_data.get("low_level_keywords", [])
-    logger.info(ll_keywords)
+    logger.debug(ll_keywords)
     if len(ll_keywords):
         ll_embedding = get_embedding(ll_keywords)
-        ll_embedding_array = np.array(ll_embedding)
+        ll_embedding_array = np.asarray(ll_embedding, dtype=vector_dtype)
         ll_results = entities_db.query(query=ll_embedding_array, top_k=5, better_than_threshold=0.02)
-        logger.info(ll_results)
-    graph = nx.read_graphml(KG_DB)
+        logger.debug(ll_results)
+    graph = get_kg_graph()
     ll_data = [graph.nodes.get(r["__entity_name__"]) for r in ll_results]
     ll_degrees = [graph.degree(r["__entity_name__"]) for r in ll_results]
-    logger.info(ll_degrees)
-    logger.info(ll_data)
+    logger.debug(ll_degrees)
+    logger.debug(ll_data)
     ll_dataset = [
         {**n, "entity_name": k["__entity_name__"], "rank": d}
         for k, n, d in zip(ll_results, ll_data, ll_degrees)
     ]
-    logger.info(ll_dataset)
+    logger.debug(ll_dataset)
     sort_kg_data_set_by_relation_size(graph, ll_dataset)
 
     # # Todo: remove duplication of functionality here
@@ -313,23 +420,24 @@ def kg_query(text):
 
 def sort_kg_data_set_by_relation_size(graph, kg_dataset):
     excerpt_ids = [row["excerpt_id"] for row in kg_dataset]
-    logger.info(excerpt_ids)
+    logger.debug(excerpt_ids)
     # Todo: create set of excerpt ids
     # Todo: edges for each node in data set by entity name
     edges = [graph.edges(row["entity_name"]) for row in kg_dataset]
-    logger.info(edges)
+    logger.debug(edges)
     sibling_node_names = set()
     for edge in edges:
         if not edge:
             continue
         sibling_node_names.update([e[1] for e in edge])
-    logger.info(sibling_node_names)
+    logger.debug(sibling_node_names)
     sibling_nodes = [graph.nodes.get(name) for name in list(sibling_node_names)]
-    logger.info(sibling_nodes)
+    logger.debug(sibling_nodes)
 
 
 if __name__ == '__main__':
     set_logger("main.log")
+    start_background_flush()
 
     delete_all_files(DATA_DIR)
     delete_all_files(LOG_DIR)
@@ -0,0 +1,77 @@
+import os
+import threading
+
+from app.definitions import DOC_ID_TO_EXCERPT_IDS, DOC_ID_TO_SOURCE_MAP, EXCERPT_DB, SOURCE_TO_DOC_ID_MAP
+from app.utilities import get_json, write_json
+
+
+class JsonStore:
+    """Write-through in-memory cache over a JSON dict file.
+
+    Every mutator and flush() takes the store's own lock, so concurrent
+    writers and the background flusher can share a store safely.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._data = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    @property
+    def data(self):
+        with self._lock:
+            if self._data is None:
+                self._data = get_json(self.file_path) if os.path.exists(self.file_path) else {}
+            return self._data
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self.data[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self.data[key] = value
+            self._dirty = True
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self.data
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self.data.get(key, default)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key in self.data:
+                self._dirty = True
+            return self.data.pop(key, default)
+
+    def update(self, items):
+        if items:
+            with self._lock:
+                self.data.update(items)
+                self._dirty = True
+
+    def snapshot(self):
+        return self.data
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                write_json(self.file_path, self.data)
+                self._dirty = False
+
+
+SOURCE_TO_DOC_ID_STORE = JsonStore(SOURCE_TO_DOC_ID_MAP)
+DOC_ID_TO_SOURCE_STORE = JsonStore(DOC_ID_TO_SOURCE_MAP)
+DOC_ID_TO_EXCERPT_IDS_STORE = JsonStore(DOC_ID_TO_EXCERPT_IDS)
+EXCERPT_STORE = JsonStore(EXCERPT_DB)
+
+DOCUMENT_STORES = (SOURCE_TO_DOC_ID_STORE, DOC_ID_TO_SOURCE_STORE, DOC_ID_TO_EXCERPT_IDS_STORE, EXCERPT_STORE)
+
+
+def flush_document_stores():
+    for store in DOCUMENT_STORES:
+        store.flush()
@@ -1,9 +1,14 @@
 import html
-import json
 import os
 import pathlib
 import re
-from hashlib import md5
+from functools import lru_cache
+from hashlib import blake2b
+
+import orjson
+
+float_pattern = re.compile(r"^[-+]?[0-9]*\.?[0-9]+$")
+control_char_table = dict.fromkeys([*range(0x00, 0x20), *range(0x7f, 0xa0)])
 
 
 def create_file_if_not_exists(file_path, default_content=""):
@@ -32,13 +37,13 @@ def delete_all_files(directory):
 
 
 def get_json(file_path):
-    with open(file_path, "r") as f:
-        return json.load(f)
+    with open(file_path, "rb") as f:
+        return orjson.loads(f.read())
 
 
 def write_json(file_path, data):
-    with open(file_path, "w") as f:
-        return json.dump(data, f, indent=4)
+    with open(file_path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
 
 
 def get_docs(root_dir):
@@ -51,27 +56,7 @@ def get_docs(root_dir):
 
 
 def make_hash(text, prefix=""):
-    return prefix + md5(text.encode()).hexdigest()
-
-
-def add_to_json(file_path, key, value):
-    with open(file_path, "r+") as f:
-        data = json.load(f)
-        data[key] = value
-        f.seek(0)
-        json.dump(data, f, indent=4)
-        f.truncate()
-
-
-def remove_from_json(file_path, key):
-    with open(file_path, "r+") as f:
-        data = json.load(f)
-        if key not in data:
-            return
-        del data[key]
-        f.seek(0)
-        json.dump(data, f, indent=4)
-        f.truncate()
+    return prefix + blake2b(text.encode(), digest_size=16).hexdigest()
 
 
 # Refer the utils functions of the official GraphRAG implementation:
@@ -82,14 +67,19 @@ def clean_str(text: str) -> str:
 
     result = html.unescape(text.strip())
     # https://stackoverflow.com/questions/4324790/removing-control-characters-from-a-string-in-python
-    return re.sub(r"[\x00-\x1f\x7f-\x9f]", "", result)
+    return result.translate(control_char_table)
+
+
+@lru_cache(maxsize=None)
+def get_marker_pattern(markers: tuple[str, ...]) -> re.Pattern:
+    return re.compile("|".join(re.escape(marker) for marker in markers))
 
 
 def split_string_by_multi_markers(content: str, markers: list[str]) -> list[str]:
     """Split a string by multiple markers."""
     if not markers:
         return [content]
-    results = re.split("|".join(re.escape(marker) for marker in markers), content)
+    results = get_marker_pattern(tuple(markers)).split(content)
     return [r.strip() for r in results if r.strip()]
 
 
@@ -98,11 +88,11 @@ def extract_json_from_text(content: str):
     if json_str is not None:
         json_str = json_str.group(0)
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
             return None
     return None
 
 
 def is_float_regex(value):
-    return bool(re.match(r"^[-+]?[0-9]*\.?[0-9]+$", value))
+    return bool(float_pattern.match(value))
@@ -0,0 +1,33 @@
+from nano_vectordb import NanoVectorDB
+
+
+class NanoVectorStore:
+    """NanoVectorDB-backed vector store behind a minimal upsert/query/delete/save interface."""
+
+    def __init__(self, dim, storage_file):
+        self.dim = dim
+        self.storage_file = storage_file
+        self._db = None
+        self._dirty = False
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = NanoVectorDB(self.dim, storage_file=self.storage_file)
+        return self._db
+
+    def upsert(self, rows):
+        self._dirty = True
+        return self.db.upsert(rows)
+
+    def query(self, query, top_k=5, better_than_threshold=None):
+        return self.db.query(query=query, top_k=top_k, better_than_threshold=better_than_threshold)
+
+    def delete(self, ids):
+        self._dirty = True
+        return self.db.delete(ids)
+
+    def save(self):
+        if self._dirty:
+            self.db.save()
+            self._dirty = False